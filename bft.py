@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+bft.py — BFT committee consensus with HBS-signed votes and quorum certificates (QCs).
+Each height: the leader proposes a block, every validator signs a prepare and a commit vote
+with its own hbs signer, and a QC of 2f+1 valid votes finalizes the phase.
+- mode="pbft":     all-to-all vote broadcast, every replica verifies every vote (O(n²) messages)
+- mode="hotstuff": votes go to the leader, which broadcasts the QC (O(n) messages, O(n·q) sigs)
+With batch=True a vote (and each HotStuff QC) is verified once per process and the verdict is shared
+by all replicas; batch=False performs every replica's check individually. Both count the same logical work.
+A height finalizes only if the proposal signature and every QC check out.
+Time to finality is compute time only (no network delay is simulated).
+"""
+import time
+import uuid
+import statistics as stats
+from pathlib import Path
+
+import hashops
+from node import Node, ReplayGuard, check_signature
+
+PHASES = ("prepare", "commit")
+MODES = ("pbft", "hotstuff")
+
+DEFAULT_COMMITTEES = [4, 16, 64, 128]
+DEFAULT_HEIGHTS = 20
+DEFAULT_PAYLOAD = 512
+
+def vote_msg(phase: str, height: int, block_hash: str) -> bytes:
+    return f"{phase}|{height}|{block_hash}".encode("utf-8")
+
+class BFTConsensus:
+    def __init__(self, nodes, mode: str = "hotstuff", batch: bool = True):
+        if mode not in MODES:
+            raise ValueError(f"Unknown BFT mode: {mode}")
+        self.nodes = nodes
+        self.mode = mode
+        self.batch = batch
+        self.n = len(nodes)
+        self.f = (self.n - 1) // 3
+        self.quorum = 2 * self.f + 1
+        self.committee = {node.node_id: node.signer.pk for node in nodes}   # voter id -> public key
+        self.replay = ReplayGuard()   # (pk, idx) of stateful votes already in a QC (anti-replay)
+        self.verifications_performed = 0
+
+    def _sign_vote(self, node: Node, phase: str, height: int, block_hash: str) -> dict:
+        sig = node.signer.sign(vote_msg(phase, height, block_hash))
+        return {"phase": phase, "height": height, "block_hash": block_hash, "voter": node.node_id,
+                "signature": sig, "public_key": node.signer.pk, "alg": node.signer.name}
+
+    def _check(self, v: dict) -> bool:
+        self.verifications_performed += 1
+        return check_signature(vote_msg(v["phase"], v["height"], v["block_hash"]),
+                               v["signature"], v["public_key"], v["alg"])
+
+    def verify_votes(self, votes) -> list:
+        # one pass over the batch; the returned verdicts are what replicas share when batch=True
+        return [self._check(v) for v in votes]
+
+    def _view(self, votes, i: int) -> list:
+        # verdicts as replica i sees them: it checks everyone else's vote and trusts its own
+        v = self.verify_votes(votes[:i] + votes[i + 1:])
+        return v[:i] + [True] + v[i:]
+
+    def build_qc(self, votes, verdicts, phase: str, height: int, block_hash: str):
+        # only votes for this exact (phase, height, block_hash) count toward the quorum
+        voters = set()
+        accepted = []
+        fresh = []
+        for v, ok in zip(votes, verdicts):
+            if not ok or v["voter"] in voters:
+                continue
+            # a vote counts only under the committee key registered for its voter id
+            if self.committee.get(v["voter"]) != v["public_key"]:
+                continue
+            if (v["phase"], v["height"], v["block_hash"]) != (phase, height, block_hash):
+                continue
+            key = self.replay.key(v["signature"], v["public_key"], v["alg"])
+            if key is not None:
+                if key in self.replay.seen:
+                    continue
+                fresh.append(key)
+            voters.add(v["voter"])
+            accepted.append(v)
+            if len(accepted) == self.quorum:
+                self.replay.seen.update(fresh)
+                return {"phase": phase, "height": height, "block_hash": block_hash, "votes": accepted}
+        return None
+
+    def run_height(self, height: int, prev_hash: str, payload_bytes: int = DEFAULT_PAYLOAD) -> dict:
+        n, q = self.n, self.quorum
+        li = height % n
+        leader = self.nodes[li]
+        performed0 = self.verifications_performed
+        snap = hashops.counter.snapshot()
+        t0 = time.perf_counter()
+
+        blk = leader.create_block(height, prev_hash, "X" * payload_bytes)
+        msgs = n - 1
+        sig_bytes = (n - 1) * len(blk["signature"])
+        logical = n - 1
+        msg = f"{blk['index']}|{blk['previous_hash']}|{blk['data']}".encode("utf-8")
+        proposal_ok = True
+        for _ in range(1 if self.batch else n - 1):
+            self.verifications_performed += 1
+            proposal_ok &= check_signature(msg, blk["signature"], blk["public_key"], blk["alg"])
+
+        # replicas only vote for a proposal whose signature checks out
+        finalized = proposal_ok
+        for phase in PHASES if proposal_ok else ():
+            votes = [self._sign_vote(node, phase, height, blk["block_hash"]) for node in self.nodes]
+            sig_len = len(votes[0]["signature"])
+            if self.mode == "pbft":
+                # every replica broadcasts its vote and verifies the n-1 it receives
+                msgs += n * (n - 1)
+                sig_bytes += n * (n - 1) * sig_len
+                logical += n * (n - 1)
+            else:
+                # votes to the leader, leader broadcasts a QC of q signatures
+                msgs += 2 * (n - 1)
+                sig_bytes += (n - 1) * sig_len + (n - 1) * q * sig_len
+                logical += (n - 1) + (n - 1) * q
+
+            if self.batch:
+                verdicts = self.verify_votes(votes)
+            elif self.mode == "pbft":
+                verdicts = [self._view(votes, i) for i in range(n)][li]
+            else:
+                verdicts = self._view(votes, li)
+
+            qc = self.build_qc(votes, verdicts, phase, height, blk["block_hash"])
+            if qc is None:
+                finalized = False
+                break
+            if self.mode == "hotstuff":
+                # each non-leader replica checks all q signatures in the broadcast QC;
+                # batched, that check runs once and its verdict is shared
+                if not all(all(self.verify_votes(qc["votes"])) for _ in range(1 if self.batch else n - 1)):
+                    finalized = False
+                    break
+
+        finality = time.perf_counter() - t0
+        ops = hashops.counter.since(snap)
+        return {
+            "height": height,
+            "block_hash": blk["block_hash"],
+            "finalized": finalized,
+            "finality_sec": finality,
+            "messages": msgs,
+            "sig_bytes": sig_bytes,
+            "verifications_logical": logical,
+            "verifications_performed": self.verifications_performed - performed0,
+            "compressions": ops["compressions"],
+        }
+
+    def run_heights(self, heights: int, payload_bytes: int = DEFAULT_PAYLOAD) -> list:
+        rows = []
+        prev_hash = "GENESIS"
+        for h in range(heights):
+            r = self.run_height(h, prev_hash, payload_bytes)
+            rows.append(r)
+            if not r["finalized"]:
+                break
+            prev_hash = r["block_hash"]
+        return rows
+
+def log_bft(rows, alg: str, mode: str, batch: bool, committee: int, quorum: int,
+            heights: int, payload_bytes: int, run_id: str) -> dict:
+    fin = [r for r in rows if r["finalized"]]
+    k = max(1, len(fin))
+    lat = [r["finality_sec"] for r in fin]
+    p50 = stats.median(lat) if lat else 0.0
+    p95 = stats.quantiles(lat, n=100)[94] if len(lat) >= 100 else (max(lat) if lat else 0.0)
+    summary = {
+        "msgs_per_block": sum(r["messages"] for r in fin) / k,
+        "sig_bytes_per_block": sum(r["sig_bytes"] for r in fin) / k,
+        "verif_logical_per_block": sum(r["verifications_logical"] for r in fin) / k,
+        "verif_performed_per_block": sum(r["verifications_performed"] for r in fin) / k,
+        "compressions_per_block": sum(r["compressions"] for r in fin) / k,
+        "finality_p50_ms": p50 * 1000.0,
+        "finality_p95_ms": p95 * 1000.0,
+        "finalized_ratio": len(fin) / max(1, heights),
+    }
+
+    path = Path("bft_log.csv")
+    need_header = not path.exists()
+    with path.open("a", encoding="utf-8") as f:
+        if need_header:
+            f.write("timestamp,run_id,alg,mode,batch,committee,quorum,heights,payload_bytes,"
+                    "msgs_per_block,sig_bytes_per_block,verif_logical_per_block,verif_performed_per_block,"
+                    "compressions_per_block,finality_p50_ms,finality_p95_ms,finalized_ratio\n")
+        f.write(",".join([
+            f"{time.time():.3f}", run_id, alg, mode, str(batch), str(committee), str(quorum),
+            str(heights), str(payload_bytes),
+            f"{summary['msgs_per_block']:.1f}",
+            f"{summary['sig_bytes_per_block']:.1f}",
+            f"{summary['verif_logical_per_block']:.1f}",
+            f"{summary['verif_performed_per_block']:.1f}",
+            f"{summary['compressions_per_block']:.1f}",
+            f"{summary['finality_p50_ms']:.6f}",
+            f"{summary['finality_p95_ms']:.6f}",
+            f"{summary['finalized_ratio']:.6f}",
+        ]) + "\n")
+    return summary
+
+def run_bft_experiment(committees=DEFAULT_COMMITTEES, heights=DEFAULT_HEIGHTS, payload_bytes=DEFAULT_PAYLOAD,
+                       modes=MODES, batch=True):
+    algorithms = ["sphincs-sim", "xmss-sim", "lms-sim"]
+    for mode in modes:
+        for committee in committees:
+            for alg in algorithms:
+                run_id = str(uuid.uuid4())[:8]
+                nodes = [Node(alg=alg, node_id=f"V{i}") for i in range(committee)]
+                cons = BFTConsensus(nodes, mode=mode, batch=batch)
+                rows = cons.run_heights(heights, payload_bytes)
+                summary = log_bft(rows, alg, mode, batch, committee, cons.quorum, heights, payload_bytes, run_id)
+                print(f"[{mode} n={committee} {alg}] {summary}")
+
+def main():
+    run_bft_experiment()
+    print("Results appended to 'bft_log.csv'.")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 # block.py
 class Block:
-    def __init__(self, index, timestamp, previous_hash, data, signature, public_key, alg):
+    def __init__(self, index, timestamp, previous_hash, data, signature, public_key, alg,
+                 sign_compressions=None, sign_bytes_hashed=None,
+                 block_hash_compressions=None, block_hash_bytes_hashed=None):
         self.index = index
         self.timestamp = timestamp
         self.previous_hash = previous_hash
@@ -8,3 +10,8 @@ class Block:
         self.signature = signature
         self.public_key = public_key
         self.alg = alg
+        # hash-cost counters from Node.create_block (None = not measured)
+        self.sign_compressions = sign_compressions
+        self.sign_bytes_hashed = sign_bytes_hashed
+        self.block_hash_compressions = block_hash_compressions
+        self.block_hash_bytes_hashed = block_hash_bytes_hashed
@@ -7,9 +7,11 @@
 # - Table_4_5_tps_by_alg_payload.csv
 # - Figure_4_TPS_by_Payload.png
 # - Figure_4_Latency_Bars_by_Alg.png
+# Latency, block-size and TPS columns carry 95% bootstrap CIs (<col>_ci_lo/<col>_ci_hi), drawn as error bars.
 
 import pandas as pd, numpy as np
 import matplotlib.pyplot as plt
+from bootstrap_ci import grouped_ci, error_bars
 
 # -----------------------
 # Load & basic cleaning
@@ -23,37 +25,35 @@ df["valid_b"] = df["valid"].astype(str).str.lower().isin({"true", "1", "yes", "y
 if "exp_tag" not in df.columns:
     df["exp_tag"] = "default"
 
+# -----------------------
+# Per-group summary with bootstrap CIs (one vectorized pass per column, no per-group lambdas)
+# -----------------------
+def summary_with_ci(by):
+    base = df.groupby(by).agg(validity_ratio=("valid_b", "mean"))
+    base["validity_ratio"] *= 100
+    return pd.concat([
+        grouped_ci(df, by, "block_size", "mean", name="avg_block_size"),
+        grouped_ci(df, by, "verify_time_sec", "median", name="median_latency_ms", scale=1000.0),
+        grouped_ci(df, by, "verify_time_sec", 95, name="p95_latency_ms", scale=1000.0),
+        base,
+    ], axis=1).round(3)
+
 # -----------------------
 # Table 4.1: Summary by algorithm
 # -----------------------
-t41 = df.groupby("alg", as_index=True).agg(
-    avg_block_size=('block_size', 'mean'),
-    median_latency_ms=('verify_time_sec', lambda x: np.median(x) * 1000),
-    p95_latency_ms=('verify_time_sec', lambda x: np.percentile(x, 95) * 1000),
-    validity_ratio=('valid_b', lambda x: x.mean() * 100)
-).round(3)
+t41 = summary_with_ci("alg")
 t41.to_csv("Table_4_1_summary_by_algorithm.csv")
 
 # -----------------------
 # Table 4.2: Summary by payload
 # -----------------------
-t42 = df.groupby("payload_bytes", as_index=True).agg(
-    avg_block_size=('block_size', 'mean'),
-    median_latency_ms=('verify_time_sec', lambda x: np.median(x) * 1000),
-    p95_latency_ms=('verify_time_sec', lambda x: np.percentile(x, 95) * 1000),
-    validity_ratio=('valid_b', lambda x: x.mean() * 100)
-).round(3)
+t42 = summary_with_ci("payload_bytes")
 t42.to_csv("Table_4_2_summary_by_payload.csv")
 
 # -----------------------
 # Table 4.3: Algorithm × payload interaction
 # -----------------------
-t43 = df.groupby(["alg", "payload_bytes"], as_index=True).agg(
-    avg_block_size=('block_size', 'mean'),
-    median_latency_ms=('verify_time_sec', lambda x: np.median(x) * 1000),
-    p95_latency_ms=('verify_time_sec', lambda x: np.percentile(x, 95) * 1000),
-    validity_ratio=('valid_b', lambda x: x.mean() * 100)
-).round(3)
+t43 = summary_with_ci(["alg", "payload_bytes"])
 t43.to_csv("Table_4_3_alg_by_payload.csv")
 
 # -----------------------
@@ -69,11 +69,17 @@ g["duration"] = (g["end"] - g["start"]).clip(lower=1e-9)
 tps_by = g.assign(tps=g["blocks"] / g["duration"])[["alg", "payload_bytes", "exp_tag", "tps"]]
 
 # Table 4.4: TPS by payload (summary across alg/tags)
-tps_payload = tps_by.groupby("payload_bytes")["tps"].agg(["mean", "median", "std"]).round(3)
+tps_payload = pd.concat([
+    tps_by.groupby("payload_bytes")["tps"].agg(["mean", "median", "std"]),
+    grouped_ci(tps_by, "payload_bytes", "tps", "mean", name="mean").drop(columns="mean"),
+], axis=1).round(3)
 tps_payload.to_csv("Table_4_4_tps_by_payload.csv")
 
 # Table 4.5: TPS by algorithm × payload
-tps_alg_payload = tps_by.groupby(["alg", "payload_bytes"])["tps"].agg(["mean", "median", "std"]).round(3)
+tps_alg_payload = pd.concat([
+    tps_by.groupby(["alg", "payload_bytes"])["tps"].agg(["mean", "median", "std"]),
+    grouped_ci(tps_by, ["alg", "payload_bytes"], "tps", "mean", name="mean").drop(columns="mean"),
+], axis=1).round(3)
 tps_alg_payload.to_csv("Table_4_5_tps_by_alg_payload.csv")
 
 # -----------------------
@@ -81,7 +87,7 @@ tps_alg_payload.to_csv("Table_4_5_tps_by_alg_payload.csv")
 # -----------------------
 # Figure: TPS vs Payload
 plt.figure(figsize=(8, 5))
-tps_payload["mean"].plot(kind="bar")
+tps_payload["mean"].plot(kind="bar", yerr=error_bars(tps_payload, "mean"), capsize=4)
 plt.ylabel("Average TPS")
 plt.xlabel("Payload (bytes)")
 plt.title("Throughput (Average TPS) by Payload")
@@ -90,8 +96,9 @@ plt.savefig("Figure_4_TPS_by_Payload.png", dpi=300)
 
 # Figure: Latency bars per algorithm (median & p95) using Table 4.1
 lat = t41[["median_latency_ms", "p95_latency_ms"]].copy()
+lat_err = np.stack([error_bars(t41, "median_latency_ms"), error_bars(t41, "p95_latency_ms")])
 plt.figure(figsize=(9, 5))
-lat.plot(kind="bar")
+lat.plot(kind="bar", yerr=lat_err, capsize=4)
 plt.ylabel("Verification Time (ms)")
 plt.xlabel("Algorithm")
 plt.title("Verification Latency by Algorithm (Median & p95)")
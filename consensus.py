@@ -1,5 +1,7 @@
 # consensus.py — simple round-robin block production with simulated propagation delay
-import time, random, hashlib
+import time, random
+import hashops
+import live_metrics
 from block import Block
 
 class Consensus:
@@ -8,23 +10,42 @@ class Consensus:
 
     def hash_block(self, block: Block) -> str:
         block_string = f"{block.index}{block.timestamp}{block.data}".encode()
-        return hashlib.sha256(block_string).hexdigest()
+        return hashops.hexdigest(block_string)
 
-    def run_rounds(self, rounds: int, payload_bytes: int = 512, delay_range=(0.01, 0.03)):
-        blocks = []
+    def produce(self, index: int, last_hash: str, payload_bytes: int = 512):
+        # one round-robin step: returns (Block, node-produced block dict)
+        node = self.nodes[index % len(self.nodes)]
+        data = ("X" * payload_bytes)  # payload
+        block_data = node.create_block(index, last_hash, data)
+        block = Block(index=block_data["index"],
+                      timestamp=time.time(),
+                      previous_hash=block_data["previous_hash"],
+                      data=block_data["data"],
+                      signature=block_data["signature"],
+                      public_key=block_data["public_key"],
+                      alg=block_data["alg"],
+                      sign_compressions=block_data["sign_compressions"],
+                      sign_bytes_hashed=block_data["sign_bytes_hashed"],
+                      block_hash_compressions=block_data["block_hash_compressions"],
+                      block_hash_bytes_hashed=block_data["block_hash_bytes_hashed"])
+        return block, block_data
+
+    def run_rounds(self, rounds: int, payload_bytes: int = 512, delay_range=(0.01, 0.03), ledger=None):
+        # ledger: optional ledger.Ledger opened for append; receives each node-produced block
+        # and is returned in place of the in-memory list of Blocks
+        blocks = [] if ledger is None else None
         last_hash = "0" * 64
+        lm = live_metrics.active()
         for i in range(rounds):
             time.sleep(random.uniform(*delay_range))  # simulate propagation
-            node = self.nodes[i % len(self.nodes)]
-            data = ("X" * payload_bytes)  # payload
-            block_data = node.create_block(i, last_hash, data)
-            block = Block(index=block_data["index"],
-                          timestamp=time.time(),
-                          previous_hash=block_data["previous_hash"],
-                          data=block_data["data"],
-                          signature=block_data["signature"],
-                          public_key=block_data["public_key"],
-                          alg=block_data["alg"])
-            blocks.append(block)
+            t0 = time.perf_counter()
+            block, block_data = self.produce(i, last_hash, payload_bytes)
+            if lm is not None:
+                lm.observe_sign(time.perf_counter() - t0)
+                lm.observe_block()
+            if ledger is None:
+                blocks.append(block)
+            else:
+                ledger.append(block_data)
             last_hash = self.hash_block(block)
-        return blocks
+        return blocks if ledger is None else ledger
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+hashops.py — pluggable hash backend with deterministic operation accounting.
+Every digest taken by hbs, node and consensus goes through here, so each sign, verify and
+block hash can be costed in compression-function calls and bytes hashed: a hardware-independent
+companion to the wall-clock timings. Backend is chosen with set_backend() or PQCS_HASH_BACKEND.
+"""
+import hashlib
+import os
+import time
+
+DIGEST_SIZE = 32
+
+# name -> (digest function, block/rate size in bytes, minimum padding bytes)
+BACKENDS = {
+    "sha256":   (lambda b: hashlib.sha256(b).digest(), 64, 9),
+    "shake256": (lambda b: hashlib.shake_256(b).digest(DIGEST_SIZE), 136, 1),
+    "blake2b":  (lambda b: hashlib.blake2b(b, digest_size=DIGEST_SIZE).digest(), 128, 0),
+    "blake2s":  (lambda b: hashlib.blake2s(b, digest_size=DIGEST_SIZE).digest(), 64, 0),
+}
+
+def compressions_for(name: str, n: int) -> int:
+    # SHA-256: Merkle–Damgård blocks incl. 9-byte padding; SHAKE256: Keccak-f permutations
+    # over the 136-byte rate (32-byte output needs no extra squeeze); BLAKE2: at least one block
+    _, block, pad = BACKENDS[name]
+    return max(1, -(-(n + pad) // block))
+
+class HashCounter:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.compressions = 0
+        self.bytes_hashed = 0
+
+    def snapshot(self) -> tuple:
+        return (self.calls, self.compressions, self.bytes_hashed)
+
+    def since(self, snap: tuple) -> dict:
+        return {
+            "hash_calls": self.calls - snap[0],
+            "compressions": self.compressions - snap[1],
+            "bytes_hashed": self.bytes_hashed - snap[2],
+        }
+
+counter = HashCounter()
+_name = "sha256"
+_fn, _block, _pad = BACKENDS[_name]
+
+def set_backend(name: str):
+    global _name, _fn, _block, _pad
+    key = (name or "").lower()
+    if key not in BACKENDS:
+        raise ValueError(f"Unknown hash backend: {name}")
+    _name = key
+    _fn, _block, _pad = BACKENDS[key]
+
+def backend_name() -> str:
+    return _name
+
+def digest(b: bytes) -> bytes:
+    n = len(b)
+    counter.calls += 1
+    counter.bytes_hashed += n
+    counter.compressions += max(1, -(-(n + _pad) // _block))
+    return _fn(b)
+
+def hexdigest(b: bytes) -> str:
+    return digest(b).hex()
+
+def benchmark(sizes=(64, 512, 2048, 16384), seconds: float = 0.2) -> list:
+    # raw throughput of each backend (uncounted), for comparing backends directly
+    rows = []
+    for name, (fn, _, _) in BACKENDS.items():
+        for size in sizes:
+            buf = os.urandom(size)
+            n = 0
+            t0 = time.perf_counter()
+            deadline = t0 + seconds
+            while time.perf_counter() < deadline:
+                for _ in range(64):
+                    fn(buf)
+                n += 64
+            dt = time.perf_counter() - t0
+            rows.append({
+                "backend": name,
+                "msg_bytes": size,
+                "hashes_per_sec": n / dt,
+                "mb_per_sec": n * size / dt / 1e6,
+                "compressions_per_hash": compressions_for(name, size),
+            })
+    return rows
+
+def main():
+    rows = benchmark()
+    with open("hash_backend_bench.csv", "w", encoding="utf-8") as f:
+        f.write("backend,msg_bytes,hashes_per_sec,mb_per_sec,compressions_per_hash\n")
+        for r in rows:
+            f.write(f"{r['backend']},{r['msg_bytes']},{r['hashes_per_sec']:.1f},{r['mb_per_sec']:.3f},{r['compressions_per_hash']}\n")
+            print(f"{r['backend']:>9} {r['msg_bytes']:>6}B  {r['mb_per_sec']:9.1f} MB/s  {r['compressions_per_hash']} compressions/hash")
+    print("Saved: hash_backend_bench.csv")
+
+set_backend(os.environ.get("PQCS_HASH_BACKEND", "sha256"))
+
+if __name__ == "__main__":
+    main()
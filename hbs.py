@@ -3,12 +3,12 @@
 hbs.py — lightweight simulators for SPHINCS+ (stateless), XMSS (stateful), LMS (stateful).
 NOT real crypto. Used for relative performance & state-behavior simulation only.
 """
-import hashlib
 import os
 import struct
+import hashops
 
 def _h(b: bytes) -> bytes:
-    return hashlib.sha256(b).digest()
+    return hashops.digest(b)
 
 class BaseSigner:
     name = "base"
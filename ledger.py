@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+ledger.py — append-only on-disk chain: a segment file of serialized blocks (<path>.seg)
+plus a fixed-width offset index (<path>.idx), both read through mmap.
+Block i is one index lookup away (O(1)), iteration walks the segment sequentially,
+and chains larger than RAM never have to be materialized as a list.
+"""
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+# index entry: (segment offset, record length)
+_IDX = struct.Struct(">QI")
+# record header: index, timestamp, hash-cost counters, then byte lengths of the variable-width fields
+_HDR = struct.Struct(">qdIIIIHIIHHHH")
+_COUNTERS = ("sign_compressions", "sign_bytes_hashed", "block_hash_compressions", "block_hash_bytes_hashed")
+_UNKNOWN = 0xFFFFFFFF   # counter not measured for this block
+_FIELDS = ("previous_hash", "data", "signature", "public_key", "alg", "producer", "block_hash")
+_BYTES_FIELDS = ("signature", "public_key")
+
+def _as_dict(block) -> dict:
+    # accept node-style dicts as well as block.Block objects
+    return block if isinstance(block, dict) else vars(block)
+
+def serialize_block(block) -> bytes:
+    b = _as_dict(block)
+    parts = []
+    for name in _FIELDS:
+        v = b.get(name, b"" if name in _BYTES_FIELDS else "")
+        parts.append(bytes(v) if name in _BYTES_FIELDS else str(v).encode("utf-8"))
+    hdr = _HDR.pack(int(b.get("index", -1)), float(b.get("timestamp", 0.0)),
+                    *(_UNKNOWN if b.get(name) is None else int(b[name]) for name in _COUNTERS),
+                    *(len(p) for p in parts))
+    return hdr + b"".join(parts)
+
+def deserialize_block(buf) -> dict:
+    mv = memoryview(buf)
+    index, ts, *rest = _HDR.unpack_from(mv, 0)
+    counters, lens = rest[:len(_COUNTERS)], rest[len(_COUNTERS):]
+    out = {"index": index, "timestamp": ts,
+           **{name: c for name, c in zip(_COUNTERS, counters) if c != _UNKNOWN}}
+    pos = _HDR.size
+    for name, n in zip(_FIELDS, lens):
+        field = mv[pos:pos + n]
+        out[name] = bytes(field) if name in _BYTES_FIELDS else str(field, "utf-8")
+        pos += n
+    return out
+
+class Ledger(Sequence):
+    def __init__(self, path, mode: str = "r"):
+        if mode not in ("r", "a"):
+            raise ValueError("mode must be 'r' or 'a'")
+        self.path = Path(path)
+        self.seg_path = self.path.with_name(self.path.name + ".seg")
+        self.idx_path = self.path.with_name(self.path.name + ".idx")
+        self.mode = mode
+        if mode == "a":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._seg_w = open(self.seg_path, "ab")
+            self._idx_w = open(self.idx_path, "ab")
+            self._tail = self._seg_w.seek(0, os.SEEK_END)
+        elif not (self.seg_path.exists() and self.idx_path.exists()):
+            raise FileNotFoundError(f"No ledger at {self.path}")
+        self._seg_map = None
+        self._idx_map = None
+        self._mapped = 0   # number of blocks covered by the current mappings
+
+    # ---- writing ----
+    def append(self, block) -> int:
+        if self.mode != "a":
+            raise IOError("ledger opened read-only")
+        rec = serialize_block(block)
+        self._seg_w.write(rec)
+        self._idx_w.write(_IDX.pack(self._tail, len(rec)))
+        self._tail += len(rec)
+        return self._idx_w.tell() // _IDX.size - 1
+
+    def extend(self, blocks):
+        for b in blocks:
+            self.append(b)
+
+    def flush(self):
+        if self.mode == "a":
+            self._seg_w.flush()
+            self._idx_w.flush()
+
+    # ---- reading ----
+    def _remap(self):
+        # map fresh objects rather than closing the old ones: an iterator may still hold a view
+        # of the previous mapping, which stays valid until that view is released
+        self.flush()
+        self._seg_map = self._idx_map = None
+        n = os.path.getsize(self.idx_path) // _IDX.size
+        if n:
+            with open(self.idx_path, "rb") as f:
+                self._idx_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self.seg_path, "rb") as f:
+                self._seg_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = n
+
+    def _unmap(self):
+        for m in (self._seg_map, self._idx_map):
+            if m is not None:
+                try:
+                    m.close()
+                except BufferError:
+                    pass   # a live iterator view still uses it; freed when the view is released
+        self._seg_map = self._idx_map = None
+        self._mapped = 0
+
+    def __len__(self):
+        self.flush()
+        return os.path.getsize(self.idx_path) // _IDX.size
+
+    def _record(self, i: int) -> memoryview:
+        if i >= self._mapped:
+            self._remap()
+        off, n = _IDX.unpack_from(self._idx_map, i * _IDX.size)
+        return memoryview(self._seg_map)[off:off + n]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("ledger index out of range")
+        rec = self._record(i)
+        try:
+            return deserialize_block(rec)
+        finally:
+            rec.release()
+
+    def __iter__(self):
+        # sequential sweep over the segment; the index is only read for the count
+        n = len(self)
+        if n == 0:
+            return
+        if self._mapped < n:
+            self._remap()
+        seg = memoryview(self._seg_map)
+        try:
+            pos = 0
+            for _ in range(n):
+                lens = _HDR.unpack_from(seg, pos)[2 + len(_COUNTERS):]
+                end = pos + _HDR.size + sum(lens)
+                yield deserialize_block(seg[pos:end])
+                pos = end
+        finally:
+            seg.release()
+
+    def close(self):
+        self._unmap()
+        if self.mode == "a":
+            self._seg_w.close()
+            self._idx_w.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+live_metrics.py — optional live instrumentation for long-running simulations.
+start() serves, from a daemon thread on localhost:
+- /metrics   Prometheus text format
+- /snapshot  JSON
+Exposes rolling-window TPS, sign/verify latency histograms, replay-index size and RSS.
+Hot paths fetch active() once per loop; when no server is running that is the only cost,
+and when one is, each observation is a bisect plus a few integer updates (no locks).
+Set PQCS_METRICS_PORT to enable it from the runners.
+"""
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_WINDOW_SEC = 60
+# seconds; sim sign/verify calls sit in the µs range, real HBS in the ms range
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1, 1.0)
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource   # Unix only
+    except ImportError:
+        return 0          # neither /proc nor resource (Windows): gauge reads 0
+    # peak, not current, RSS where /proc is unavailable; ru_maxrss is bytes on macOS, kB elsewhere
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float):
+        self.counts[bisect.bisect_left(self.buckets, v)] += 1
+        self.sum += v
+        self.count += 1
+
+    def cumulative(self) -> list:
+        out, acc = [], 0
+        for c in self.counts:
+            acc += c
+            out.append(acc)
+        return out
+
+class LiveMetrics:
+    def __init__(self, window_sec: int = DEFAULT_WINDOW_SEC):
+        self.window_sec = window_sec
+        self.started = time.time()
+        self.blocks_total = 0
+        self._per_sec = deque()   # [second, blocks] pairs inside the window
+        self.sign = Histogram()
+        self.verify = Histogram()
+        self.replay_index_size = 0
+
+    def observe_block(self, n: int = 1):
+        self.blocks_total += n
+        sec = int(time.time())
+        ps = self._per_sec
+        if ps and ps[-1][0] == sec:
+            ps[-1][1] += n
+            return
+        ps.append([sec, n])
+        while ps and ps[0][0] <= sec - self.window_sec:
+            ps.popleft()
+
+    def observe_sign(self, sec: float):
+        self.sign.observe(sec)
+
+    def observe_verify(self, sec: float):
+        self.verify.observe(sec)
+
+    def set_replay_index(self, n: int):
+        self.replay_index_size = n
+
+    def tps(self) -> float:
+        now = time.time()
+        lo = int(now) - self.window_sec
+        blocks = sum(c for s, c in list(self._per_sec) if s > lo)
+        span = min(self.window_sec, max(now - self.started, 1e-9))
+        return blocks / span
+
+    def snapshot(self) -> dict:
+        def hist(h: Histogram) -> dict:
+            return {"count": h.count, "sum": h.sum,
+                    "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.cumulative()))}
+        return {
+            "timestamp": time.time(),
+            "uptime_sec": time.time() - self.started,
+            "window_sec": self.window_sec,
+            "tps": self.tps(),
+            "blocks_total": self.blocks_total,
+            "sign_latency_seconds": hist(self.sign),
+            "verify_latency_seconds": hist(self.verify),
+            "replay_index_size": self.replay_index_size,
+            "rss_bytes": _rss_bytes(),
+        }
+
+    def prometheus(self) -> str:
+        lines = [
+            "# HELP pqcs_tps Blocks per second over the rolling window.",
+            "# TYPE pqcs_tps gauge",
+            f'pqcs_tps{{window_sec="{self.window_sec}"}} {self.tps():.6f}',
+            "# HELP pqcs_blocks_total Blocks produced since start.",
+            "# TYPE pqcs_blocks_total counter",
+            f"pqcs_blocks_total {self.blocks_total}",
+        ]
+        for name, h, what in (("pqcs_sign_latency_seconds", self.sign, "Block signing latency."),
+                              ("pqcs_verify_latency_seconds", self.verify, "Block verification latency.")):
+            lines += [f"# HELP {name} {what}", f"# TYPE {name} histogram"]
+            for le, c in zip([repr(b) for b in h.buckets] + ["+Inf"], h.cumulative()):
+                lines.append(f'{name}_bucket{{le="{le}"}} {c}')
+            lines += [f"{name}_sum {h.sum:.9f}", f"{name}_count {h.count}"]
+        lines += [
+            "# HELP pqcs_replay_index_size Stateful indices held by the verifier's anti-replay set.",
+            "# TYPE pqcs_replay_index_size gauge",
+            f"pqcs_replay_index_size {self.replay_index_size}",
+            "# HELP pqcs_rss_bytes Resident set size of the simulator process.",
+            "# TYPE pqcs_rss_bytes gauge",
+            f"pqcs_rss_bytes {_rss_bytes()}",
+        ]
+        return "\n".join(lines) + "\n"
+
+_live = None
+_server = None
+
+def active():
+    # None unless start() has been called; hot loops fetch this once and test for None
+    return _live
+
+def _handler_for(metrics: LiveMetrics):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics"):
+                body, ctype = metrics.prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+            elif self.path.startswith("/snapshot") or self.path == "/":
+                body, ctype = json.dumps(metrics.snapshot()).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass   # keep the runners' console output clean
+    return Handler
+
+def start(port: int = 9464, host: str = "127.0.0.1", window_sec: int = DEFAULT_WINDOW_SEC) -> LiveMetrics:
+    global _live, _server
+    if _live is not None:
+        return _live
+    metrics = LiveMetrics(window_sec)
+    _server = ThreadingHTTPServer((host, port), _handler_for(metrics))
+    threading.Thread(target=_server.serve_forever, name="pqcs-live-metrics", daemon=True).start()
+    _live = metrics
+    print(f"Live metrics: http://{host}:{_server.server_address[1]}/metrics (JSON: /snapshot)")
+    return metrics
+
+def start_from_env():
+    port = os.environ.get("PQCS_METRICS_PORT")
+    return start(int(port)) if port else None
+
+def stop():
+    global _live, _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+    _live = _server = None
@@ -1,27 +1,33 @@
 # main.py — interactive runner for experiments
-import time
+import uuid
 from consensus import Consensus
 from node import Node
 from metrics import log_metrics
 from adversary import tamper, replay
+import live_metrics
 
 ALG_LIST = ["sphincs-sim", "xmss-sim", "lms-sim"]
 
-def run_for_alg(alg: str, rounds: int, nodes_n: int, payload: int, tag: str):
-    nodes = [Node(f"{alg}-Node{i}", alg=alg) for i in range(nodes_n)]
+def run_for_alg(alg: str, rounds: int, nodes_n: int, payload: int, tag: str, ledger=None):
+    nodes = [Node(alg=alg, node_id=f"{alg}-Node{i}") for i in range(nodes_n)]
     cons = Consensus(nodes)
-    t0 = time.time()
-    blocks = cons.run_rounds(rounds, payload_bytes=payload)
-    t1 = time.time()
-    log_metrics(blocks, nodes, label=alg, started_at=t0, ended_at=t1,
-                meta={"exp_tag": tag, "nodes": nodes_n, "rounds": rounds, "payload_bytes": payload})
+    blocks = cons.run_rounds(rounds, payload_bytes=payload, ledger=ledger)
+    if ledger is None:
+        # Consensus returns Block objects; metrics and verify_block work on dicts
+        blocks = [{**vars(b), "producer": nodes[b.index % nodes_n].node_id} for b in blocks]
+
+    # one verifier replays the whole chain, then sees the adversarial copies
+    verifier = Node(alg=alg, node_id="verifier")
+    summary = log_metrics(blocks, verifier, alg=alg, nodes=nodes_n, rounds=rounds, payload_bytes=payload,
+                          exp_tag=tag, run_id=str(uuid.uuid4())[:8])
+    print(f"Summary: {summary}")
 
     # Adversarial checks (simple functional checks)
-    tampered = tamper(blocks[0].__dict__)
-    tamper_ok = not nodes[0].verify_block(tampered)
-    replayed = replay(blocks[1].__dict__)
+    tampered = tamper(blocks[0])
+    tamper_ok = not verifier.verify_block(tampered)
+    replayed = replay(blocks[1])
     is_stateless = "sphincs" in alg
-    replay_ok = (not nodes[1].verify_block(replayed)) if not is_stateless else nodes[1].verify_block(replayed)
+    replay_ok = (not verifier.verify_block(replayed)) if not is_stateless else verifier.verify_block(replayed)
 
     print("Adversarial checks:")
     print(f" - Tamper: {'PASS' if tamper_ok else 'FAIL'}")
@@ -38,6 +44,7 @@ def prompt_str(prompt, default):
 
 def main():
     print("Interactive experiment runner (press Enter to accept defaults)")
+    live_metrics.start_from_env()   # PQCS_METRICS_PORT=9464 to serve /metrics while running
     rounds = prompt_int("Number of blocks (ROUNDS)", 200)
     nodes_n = prompt_int("Number of nodes (NODES)", 8)
     payload = prompt_int("Payload size in bytes (PAYLOAD: 512≈0.5KB, 2048≈2KB)", 512)
@@ -13,7 +13,10 @@ import random
 from pathlib import Path
 
 import hbs
+import hashops
+import live_metrics
 from node import Node
+from ledger import Ledger
 from metrics import log_metrics
 import adversary
 
@@ -23,6 +26,7 @@ DEFAULT_TRIALS = 3
 DEFAULT_PAYLOADS = [512, 2048]
 DEFAULT_TAG_PREFIX = "EXP"
 ADV_SAMPLES_PER_RUN = 5
+ALGORITHMS = ["sphincs-sim", "xmss-sim", "lms-sim"]
 
 def _ensure_outdir() -> Path:
     out = Path("."); out.mkdir(exist_ok=True, parents=True); return out
@@ -50,57 +54,76 @@ def _adversarial_check(blocks, node: Node, run_id: str, alg: str, payload_bytes:
     return {"tamper_total": len(sampled), "tamper_rejected": tamper_rejected,
             "replay_total": len(sampled), "replay_rejected": replay_rejected}
 
-def run_experiment(rounds=DEFAULT_ROUNDS, nodes=DEFAULT_NODES, trials=DEFAULT_TRIALS,
-                   tag_prefix=DEFAULT_TAG_PREFIX, payloads=DEFAULT_PAYLOADS):
-    algorithms = ["sphincs-sim", "xmss-sim", "lms-sim"]
+def run_trial(alg: str, payload_bytes: int, trial: int, rounds=DEFAULT_ROUNDS, nodes=DEFAULT_NODES,
+              tag_prefix=DEFAULT_TAG_PREFIX, ledger_dir=None):
+    # ledger_dir: if set, the chain is written to <ledger_dir>/<exp_tag>_<run_id>.seg/.idx
+    # and verified back from disk instead of being held in memory
+    run_id = str(uuid.uuid4())[:8]
+    exp_tag = f"{tag_prefix}_{alg}_{payload_bytes}B_T{trial}"
+    print(f"\n=== RUN {exp_tag} (run_id={run_id}) ===")
+    print(f"Rounds={rounds}  Nodes={nodes}  Payload={payload_bytes}  Alg={alg}")
 
-    for payload_bytes in payloads:
-        for trial in range(1, trials + 1):
-            for alg in algorithms:
-                run_id = str(uuid.uuid4())[:8]
-                exp_tag = f"{tag_prefix}_{alg}_{payload_bytes}B_T{trial}"
-                print(f"\n=== RUN {exp_tag} (run_id={run_id}) ===")
-                print(f"Rounds={rounds}  Nodes={nodes}  Payload={payload_bytes}  Alg={alg}")
+    # Node: accept (alg) to build its own signer
+    node = Node(alg=alg, node_id="N0")
 
-                # Node: accept (alg) to build its own signer
-                node = Node(alg=alg, node_id="N0")
+    # produce chain
+    produced_blocks = [] if ledger_dir is None else Ledger(Path(ledger_dir) / f"{exp_tag}_{run_id}", mode="a")
+    prev_hash = "GENESIS"
+    lm = live_metrics.active()
+    for i in range(rounds):
+        data = "X" * payload_bytes
+        t0 = time.perf_counter()
+        blk = node.create_block(index=i, previous_hash=prev_hash, data=data)
+        if lm is not None:
+            lm.observe_sign(time.perf_counter() - t0)
+            lm.observe_block()
+        produced_blocks.append(blk)
+        prev_hash = blk["block_hash"]
 
-                # produce chain
-                produced_blocks = []
-                prev_hash = "GENESIS"
-                for i in range(rounds):
-                    data = "X" * payload_bytes
-                    blk = node.create_block(index=i, previous_hash=prev_hash, data=data)
-                    produced_blocks.append(blk)
-                    prev_hash = blk["block_hash"]
+    # metrics summary with TPS/p50/p95/valid_ratio
+    summary = log_metrics(
+        blocks=produced_blocks,
+        node=node,
+        alg=alg,
+        nodes=nodes,
+        rounds=rounds,
+        payload_bytes=payload_bytes,
+        exp_tag=exp_tag,
+        run_id=run_id
+    )
+    print(f"Summary: {summary}")
 
-                # metrics summary with TPS/p50/p95/valid_ratio
-                summary = log_metrics(
-                    blocks=produced_blocks,
-                    node=node,
-                    alg=alg,
-                    nodes=nodes,
-                    rounds=rounds,
-                    payload_bytes=payload_bytes,
-                    exp_tag=exp_tag,
-                    run_id=run_id
-                )
-                print(f"Summary: {summary}")
+    # adversarial
+    adv_summary = _adversarial_check(
+        blocks=produced_blocks,
+        node=node,
+        run_id=run_id,
+        alg=alg,
+        payload_bytes=payload_bytes,
+        exp_tag=exp_tag,
+        nodes=nodes,
+        rounds=rounds
+    )
+    print(f"Adversarial Summary: {adv_summary}")
+    if ledger_dir is not None:
+        produced_blocks.close()
+    return summary, adv_summary
 
-                # adversarial
-                adv_summary = _adversarial_check(
-                    blocks=produced_blocks,
-                    node=node,
-                    run_id=run_id,
-                    alg=alg,
-                    payload_bytes=payload_bytes,
-                    exp_tag=exp_tag,
-                    nodes=nodes,
-                    rounds=rounds
-                )
-                print(f"Adversarial Summary: {adv_summary}")
+def run_experiment(rounds=DEFAULT_ROUNDS, nodes=DEFAULT_NODES, trials=DEFAULT_TRIALS,
+                   tag_prefix=DEFAULT_TAG_PREFIX, payloads=DEFAULT_PAYLOADS, ledger_dir=None,
+                   hash_backend=None):
+    # hash_backend: sha256 / shake256 / blake2b / blake2s (default: hashops' current backend)
+    if hash_backend is not None:
+        hashops.set_backend(hash_backend)
+
+    for payload_bytes in payloads:
+        for trial in range(1, trials + 1):
+            for alg in ALGORITHMS:
+                run_trial(alg, payload_bytes, trial, rounds=rounds, nodes=nodes,
+                          tag_prefix=tag_prefix, ledger_dir=ledger_dir)
 
 def main():
+    live_metrics.start_from_env()   # PQCS_METRICS_PORT=9464 to serve /metrics while running
     run_experiment()
 
 if __name__ == "__main__":
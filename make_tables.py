@@ -2,11 +2,12 @@
 """
 make_tables.py — builds Chapter 4 tables from blockchain_metrics.csv and verification_log.csv
 Robust to mixed dtypes (casts numerics), and uses string aggregations to avoid FutureWarnings.
+Latency, block-size and TPS columns carry 95% percentile-bootstrap CIs (<col>_ci_lo/<col>_ci_hi).
 """
 from pathlib import Path
 import sys
 import pandas as pd
-import numpy as np
+from bootstrap_ci import grouped_ci
 
 OUT_DIR = Path(".")
 
@@ -28,6 +29,7 @@ def to_num(df, cols):
 def main():
     metrics_df = load_csv_safely("blockchain_metrics.csv")
     vlog_df    = load_csv_safely("verification_log.csv")
+    cost_df    = load_csv_safely("hash_cost_log.csv") if Path("hash_cost_log.csv").exists() else None
     if metrics_df is None:
         print("[FATAL] Run main_with_adversary.py first."); sys.exit(1)
 
@@ -53,34 +55,34 @@ def main():
         .agg(
             rows=("valid", "size"),
             valid_rate=("valid", "mean"),
-            block_size_mean=("block_size", "mean"),
-            verify_time_mean=("verify_time_sec", "mean"),
         )
+        .join([grouped_ci(metrics_df, "alg", "block_size", "mean", name="block_size_mean"),
+               grouped_ci(metrics_df, "alg", "verify_time_sec", "mean", name="verify_time_mean")])
         .reset_index()
     )
     t41["valid_rate"] = (t41["valid_rate"] * 100.0).round(2)
+    # deterministic hash-cost columns, per block, from hash_cost_log.csv when present;
+    # counts differ by backend, so each (alg, hash_backend) pair gets its own row
+    if cost_df is not None and "kind" in cost_df.columns:
+        cost_cols = ["sign_compressions", "verify_compressions"]
+        blk = to_num(cost_df[cost_df["kind"] == "block"].copy(), cost_cols)
+        cost = blk.groupby(["alg", "hash_backend"], dropna=False)[cost_cols].mean().add_suffix("_mean")
+        t41 = t41.merge(cost.reset_index(), on="alg", how="left")
     t41.to_csv(OUT_DIR / "Table_4_1_summary_by_algorithm.csv", index=False)
 
     # ------------- Table 4.2 — verify-time distribution by algorithm -------------
-    # Use string aggregations to avoid FutureWarnings
-    t42 = (
-        metrics_df
-        .groupby("alg", dropna=False)["verify_time_sec"]
-        .agg(median="median", p95=lambda s: np.percentile(s.dropna(), 95) if len(s.dropna()) else np.nan)
-        .reset_index()
-    )
-    t42["median_ms"] = t42["median"] * 1000.0
-    t42["p95_ms"]    = t42["p95"] * 1000.0
-    t42 = t42.drop(columns=["median", "p95"])
+    # Point estimates and bootstrap CIs come from one vectorized pass (no per-group lambdas)
+    t42 = pd.concat([
+        grouped_ci(metrics_df, "alg", "verify_time_sec", "median", name="median_ms", scale=1000.0),
+        grouped_ci(metrics_df, "alg", "verify_time_sec", 95, name="p95_ms", scale=1000.0),
+    ], axis=1).reset_index()
     t42.to_csv(OUT_DIR / "Table_4_2_verify_time_by_algorithm.csv", index=False)
 
     # ----------------- Table 4.3 — block size by algorithm -----------------
-    t43 = (
-        metrics_df
-        .groupby("alg", dropna=False)["block_size"]
-        .agg(mean="mean", median="median")
-        .reset_index()
-    )
+    t43 = pd.concat([
+        grouped_ci(metrics_df, "alg", "block_size", "mean", name="mean"),
+        grouped_ci(metrics_df, "alg", "block_size", "median", name="median"),
+    ], axis=1).reset_index()
     t43.to_csv(OUT_DIR / "Table_4_3_block_size_by_algorithm.csv", index=False)
 
     # ----------------- Table 4.4 — TPS by payload (from vlog) --------------
@@ -90,11 +92,12 @@ def main():
         s = to_num(s, ["tps", "payload_bytes"])
         s = s.dropna(subset=["tps"])
         if not s.empty:
-            t44 = (
-                s.groupby(["alg","payload_bytes"], dropna=False)["tps"]
-                .agg(mean_tps="mean", median_tps="median", runs="size")
-                .reset_index()
-            )
+            runs = s.groupby(["alg","payload_bytes"])["tps"].size().rename("runs")
+            t44 = pd.concat([
+                grouped_ci(s, ["alg","payload_bytes"], "tps", "mean", name="mean_tps"),
+                grouped_ci(s, ["alg","payload_bytes"], "tps", "median", name="median_tps"),
+                runs,
+            ], axis=1).reset_index()
             t44.to_csv(OUT_DIR / "Table_4_4_tps_by_payload.csv", index=False)
         else:
             print("[INFO] No numeric TPS rows found for Table_4_4.")
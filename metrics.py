@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """
 metrics.py
-- Verifies each produced block with the provided node.
+- Verifies each produced block with the provided node (`blocks` may be a list or an on-disk ledger.Ledger).
 - Measures per-block verification time (seconds), computes p50/p95.
+- Counts hash compression calls / bytes hashed per sign, block hash and verify (hashops.py), a noise-free cost next to the timings.
 - Writes per-block rows to blockchain_metrics.csv and a per-run summary to verification_log.csv (kind=summary) including 'tps'.
+- Hash-cost counts go to hash_cost_log.csv (kind=block / kind=summary, keyed by run_id and index) so the
+  two files above keep their original schema.
 """
 from __future__ import annotations
 import time
 from pathlib import Path
 import statistics as stats
+import hashops
+import live_metrics
 
 def _ensure(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -17,18 +22,39 @@ def log_metrics(blocks, node, alg: str, nodes: int, rounds: int, payload_bytes:
     out_path = Path("blockchain_metrics.csv")
     _ensure(out_path)
     need_header = not out_path.exists()
+    cost_path = Path("hash_cost_log.csv")
+    need_cost_header = not cost_path.exists()
 
     verify_times = []
     valid_count = 0
+    backend = hashops.backend_name()
+    produce_cols = ("sign_compressions", "sign_bytes_hashed", "block_hash_compressions", "block_hash_bytes_hashed")
+    totals = dict.fromkeys(produce_cols + ("verify_compressions", "verify_bytes_hashed"), 0)
+    lm = live_metrics.active()
 
-    with out_path.open("a", encoding="utf-8") as f:
+    with out_path.open("a", encoding="utf-8") as f, cost_path.open("a", encoding="utf-8") as cf:
         if need_header:
             f.write("exp_tag,run_id,alg,index,timestamp,producer,nodes,rounds,payload_bytes,block_size,previous_hash,block_hash,verify_time_sec,valid\n")
+        if need_cost_header:
+            cf.write("timestamp,run_id,exp_tag,alg,payload_bytes,kind,index,hash_backend,"
+                     "sign_compressions,sign_bytes_hashed,block_hash_compressions,block_hash_bytes_hashed,"
+                     "verify_compressions,verify_bytes_hashed\n")
 
         for b in blocks:
+            snap = hashops.counter.snapshot()
             t0 = time.perf_counter()
             ok = node.verify_block(b)
             dt = time.perf_counter() - t0  # seconds
+            vops = hashops.counter.since(snap)
+            if lm is not None:
+                lm.observe_verify(dt)
+                lm.set_replay_index(len(getattr(node, "used_indices", ())))
+            for col in produce_cols:
+                # a run total is only known if every block carried the count
+                v = b.get(col)
+                totals[col] = None if v is None or totals[col] is None else totals[col] + v
+            totals["verify_compressions"] += vops["compressions"]
+            totals["verify_bytes_hashed"] += vops["bytes_hashed"]
             verify_times.append(dt)
             if ok:
                 valid_count += 1
@@ -50,7 +76,15 @@ def log_metrics(blocks, node, alg: str, nodes: int, rounds: int, payload_bytes:
                 b.get("previous_hash", ""),
                 b.get("block_hash", ""),
                 f"{dt:.9f}",
-                "True" if ok else "False"
+                "True" if ok else "False",
+            ]) + "\n")
+            cf.write(",".join([
+                f"{time.time():.3f}", run_id, exp_tag, alg, str(payload_bytes), "block",
+                str(b.get("index", -1)),
+                backend,
+                *("" if b.get(col) is None else str(b[col]) for col in produce_cols),
+                str(vops["compressions"]),
+                str(vops["bytes_hashed"]),
             ]) + "\n")
 
     # aggregates
@@ -79,5 +113,15 @@ def log_metrics(blocks, node, alg: str, nodes: int, rounds: int, payload_bytes:
             f"{p95*1000.0:.6f}",
             f"{valid_ratio:.6f}",
         ]) + "\n")
+    with cost_path.open("a", encoding="utf-8") as cf:
+        cf.write(",".join([
+            f"{time.time():.3f}", run_id, exp_tag, alg, str(payload_bytes), "summary", "",
+            backend,
+            *("" if v is None else str(v) for v in totals.values()),
+        ]) + "\n")
 
-    return {"tps": tps, "p50_ms": p50 * 1000.0, "p95_ms": p95 * 1000.0, "valid_ratio": valid_ratio}
+    summary = {"tps": tps, "p50_ms": p50 * 1000.0, "p95_ms": p95 * 1000.0, "valid_ratio": valid_ratio,
+               "hash_backend": backend, **totals}
+    if getattr(node, "cache", None) is not None:
+        summary.update(node.cache.stats())
+    return summary
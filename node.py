@@ -2,13 +2,14 @@
 """
 node.py — wraps a signer, creates and verifies blocks, and enforces anti-replay for stateful HBS.
 """
-import hashlib
 import time
 import struct
+import hashops
 import hbs as hbs_mod
+import verify_cache
 
 def _hash_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
+    return hashops.hexdigest(b)
 
 def _parse_idx_from_sig(sig: bytes):
     # Our stateful sims append a 4-byte big-endian index at the tail.
@@ -16,12 +17,59 @@ def _parse_idx_from_sig(sig: bytes):
         return None
     return struct.unpack(">I", sig[-4:])[0]
 
+def is_stateful(alg: str) -> bool:
+    a = (alg or "").lower()
+    return ("xmss" in a) or ("lms" in a)
+
+def check_signature(msg: bytes, sig: bytes, pk: bytes, alg: str) -> bool:
+    # pure MAC check (no anti-replay); stateful sims bind the tail index into the MAC
+    if is_stateful(alg):
+        idx = _parse_idx_from_sig(sig)
+        if idx is None:
+            return False
+        expected_mac = hashops.digest(pk + msg + struct.pack(">I", idx))[:8]
+    else:
+        expected_mac = hashops.digest(pk + msg)[:8]
+    return sig[:8] == expected_mac
+
+def data_digest(data: str) -> str:
+    return _hash_hex(str(data).encode("utf-8"))
+
+def header_hash(index: int, ts: float, previous_hash: str, data_hash: str) -> str:
+    # block_hash commits to the header only, so a light client can re-hash headers without the payload
+    return _hash_hex(f"{index}|{ts}|{previous_hash}|{data_hash}".encode("utf-8"))
+
+def compute_block_hash(index: int, ts: float, previous_hash: str, data: str) -> str:
+    return header_hash(index, ts, previous_hash, data_digest(data))
+
+class ReplayGuard:
+    # signature check plus (pk, idx) anti-replay, so producers that share index 0 do not collide.
+    # The single stateful replay check: Node.verify_block and bft.BFTConsensus delegate here.
+    def __init__(self):
+        self.seen = set()
+
+    def key(self, sig: bytes, pk: bytes, alg: str):
+        # (pk, idx) for stateful schemes, None for stateless ones
+        return (pk, _parse_idx_from_sig(sig)) if is_stateful(alg) else None
+
+    def accept(self, msg: bytes, sig: bytes, pk: bytes, alg: str, check=check_signature) -> bool:
+        key = self.key(sig, pk, alg)
+        if key is not None and (key[1] is None or key in self.seen):
+            return False
+        ok = check(msg, sig, pk, alg)
+        if ok and key is not None:
+            self.seen.add(key)
+        return ok
+
 class Node:
-    def __init__(self, alg=None, node_id="N0", signer=None):
+    def __init__(self, alg=None, node_id="N0", signer=None, cache=None):
         # allow either alg or a ready-made signer
         self.signer = signer if signer is not None else hbs_mod.make_signer(alg)
         self.node_id = node_id
-        self.used_indices = set()  # for stateful anti-replay
+        self.replay = ReplayGuard()
+        self.used_indices = self.replay.seen   # (pk, idx) of accepted stateful signatures
+        self.cache = cache         # optional shared VerifyCache (stateless results only)
+        self.sig_checks = 0        # signature checks actually computed (cache misses + stateful)
 
     def _msg_bytes(self, index: int, prev_hash: str, data: str) -> bytes:
         return f"{index}|{prev_hash}|{data}".encode("utf-8")
@@ -29,8 +77,13 @@ class Node:
     def create_block(self, index: int, previous_hash: str, data: str) -> dict:
         ts = time.time()
         msg = self._msg_bytes(index, previous_hash, data)
+        snap = hashops.counter.snapshot()
         sig = self.signer.sign(msg)
-        blk_hash = _hash_hex(f"{index}|{ts}|{previous_hash}|{data}".encode("utf-8"))
+        sign_ops = hashops.counter.since(snap)
+        snap = hashops.counter.snapshot()
+        d_hash = data_digest(data)
+        blk_hash = header_hash(index, ts, previous_hash, d_hash)
+        hash_ops = hashops.counter.since(snap)
         return {
             "index": index,
             "timestamp": ts,
@@ -40,43 +93,34 @@ class Node:
             "public_key": self.signer.pk,
             "alg": self.signer.name,
             "producer": self.node_id,
+            "data_hash": d_hash,
             "block_hash": blk_hash,
+            # deterministic cost accounting (see hashops.py)
+            "sign_compressions": sign_ops["compressions"],
+            "sign_bytes_hashed": sign_ops["bytes_hashed"],
+            "block_hash_compressions": hash_ops["compressions"],
+            "block_hash_bytes_hashed": hash_ops["bytes_hashed"],
         }
 
     def verify_block(self, b: dict) -> bool:
-        import struct, hashlib
-
-        def _h(x: bytes) -> bytes:
-            return hashlib.sha256(x).digest()
-
         # reconstruct message
         msg = self._msg_bytes(b.get("index", -1), b.get("previous_hash", ""), b.get("data", ""))
         sig = b.get("signature", b"")
         pk = b.get("public_key", b"")
         alg = (b.get("alg") or "").lower()
 
-        # is this a stateful scheme?
-        stateful = ("xmss" in alg) or ("lms" in alg)
-
-        # for XMSS/LMS, the last 4 bytes of sig encode the index used during signing
-        idx = None
-        if stateful:
-            if len(sig) < 4:
-                return False
-            idx = struct.unpack(">I", sig[-4:])[0]
-
-            # anti-replay: reject if index already used
-            if idx in self.used_indices:
-                return False
+        if is_stateful(alg):
+            # stateful results never touch the cache: the replay check must run every time
+            return self.replay.accept(msg, sig, pk, alg, check=self._check)
+        if self.cache is not None:
+            key = verify_cache.cache_key(pk, msg, sig)
+            ok = self.cache.get(key)
+            if ok is None:
+                ok = self._check(msg, sig, pk, alg)
+                self.cache.put(key, ok)
+            return ok
+        return self._check(msg, sig, pk, alg)
 
-            expected_mac = _h(pk + msg + struct.pack(">I", idx))[:8]
-        else:
-            expected_mac = _h(pk + msg)[:8]
-
-        ok = (sig[:8] == expected_mac)
-
-        # record index only on success for stateful schemes
-        if ok and stateful and idx is not None:
-            self.used_indices.add(idx)
-
-        return ok
+    def _check(self, msg: bytes, sig: bytes, pk: bytes, alg: str) -> bool:
+        self.sig_checks += 1
+        return check_signature(msg, sig, pk, alg)
@@ -5,6 +5,7 @@ plot_figures.py — generates paper figures (matplotlib, one plot per figure, no
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
+from bootstrap_ci import grouped_ci, error_bars
 
 def load_csv(path):
     p = Path(path)
@@ -23,13 +24,14 @@ def fig1_tps_by_payload(vlog):
     # drop rows where tps is NaN after coercion
     s = s.dropna(subset=['tps', 'payload_bytes'])
 
-    # median TPS per alg & payload
-    piv = s.groupby(['alg', 'payload_bytes'])['tps'].median().reset_index()
+    # median TPS per alg & payload, with bootstrap CI
+    piv = grouped_ci(s, ['alg', 'payload_bytes'], 'tps', 'median', name='tps').reset_index()
 
     plt.figure()
     for alg in piv['alg'].unique():
         sub = piv[piv['alg'] == alg]
-        plt.plot(sub['payload_bytes'], sub['tps'], marker='o', label=alg)
+        plt.errorbar(sub['payload_bytes'], sub['tps'], yerr=error_bars(sub, 'tps'),
+                     marker='o', capsize=4, label=alg)
     plt.xlabel("Payload (bytes)")
     plt.ylabel("TPS (verification proxy)")
     plt.title("Figure 1 – TPS by Payload")
@@ -52,9 +54,9 @@ def fig2_latency_box(metrics):
     plt.close()
 
 def fig3_block_size(metrics):
-    piv = metrics.groupby('alg')['block_size'].median().reset_index()
+    piv = grouped_ci(metrics, 'alg', 'block_size', 'median', name='block_size').reset_index()
     plt.figure()
-    plt.bar(piv['alg'], piv['block_size'])
+    plt.bar(piv['alg'], piv['block_size'], yerr=error_bars(piv, 'block_size'), capsize=4)
     plt.ylabel("Block size (bytes, median)")
     plt.title("Figure 3 – Block Size by Algorithm")
     plt.tight_layout()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+scheduler.py — adaptive sequential trial scheduling for algorithm × payload cells.
+Every cell first gets MIN_TRIALS runs (main_with_adversary.run_trial). After that, the next trial
+always goes to the cell whose bootstrap CI on median TPS or median p95 latency is widest relative
+to its point estimate. A cell stops once both widths are within the target, or once it has used
+its per-cell trial budget. The CIs for all cells come from one vectorized call (bootstrap_ci).
+Trial count and final CI for each cell are written to adaptive_trials.csv.
+"""
+import time
+from pathlib import Path
+
+import numpy as np
+
+import live_metrics
+from bootstrap_ci import bootstrap_groups
+from main_with_adversary import (run_trial, ALGORITHMS, DEFAULT_ROUNDS, DEFAULT_NODES,
+                                 DEFAULT_PAYLOADS, DEFAULT_TAG_PREFIX)
+
+DEFAULT_TARGET_REL_WIDTH = 0.10   # (ci_hi - ci_lo) / point
+DEFAULT_MIN_TRIALS = 3
+DEFAULT_MAX_TRIALS = 20           # per-cell budget
+METRICS = ("tps", "p95_ms")
+
+def cell_cis(results: dict, n_resamples: int = 2000, seed: int = 0) -> dict:
+    """results: {cell: {"tps": [...], "p95_ms": [...]}} -> {cell: {metric: (point, lo, hi, rel_width)}}"""
+    cells = list(results)
+    out = {c: {} for c in cells}
+    for metric in METRICS:
+        values = np.concatenate([results[c][metric] for c in cells])
+        codes = np.repeat(np.arange(len(cells)), [len(results[c][metric]) for c in cells])
+        point, lo, hi = bootstrap_groups(values, codes, stat="median", n_resamples=n_resamples, seed=seed)
+        rel = (hi - lo) / np.maximum(np.abs(point), 1e-12)
+        for i, c in enumerate(cells):
+            out[c][metric] = (point[i], lo[i], hi[i], rel[i])
+    return out
+
+def _width(ci: dict) -> float:
+    return max(ci[m][3] for m in METRICS)
+
+def run_adaptive(rounds=DEFAULT_ROUNDS, nodes=DEFAULT_NODES, payloads=DEFAULT_PAYLOADS,
+                 tag_prefix=DEFAULT_TAG_PREFIX, target=DEFAULT_TARGET_REL_WIDTH,
+                 min_trials=DEFAULT_MIN_TRIALS, max_trials=DEFAULT_MAX_TRIALS) -> dict:
+    if min_trials < 2 or max_trials < min_trials:
+        raise ValueError("need 2 <= min_trials <= max_trials")
+    cells = [(alg, p) for p in payloads for alg in ALGORITHMS]
+    results = {c: {"tps": [], "p95_ms": []} for c in cells}
+
+    def trial(cell):
+        alg, payload_bytes = cell
+        n = len(results[cell]["tps"]) + 1
+        summary, _ = run_trial(alg, payload_bytes, n, rounds=rounds, nodes=nodes, tag_prefix=tag_prefix)
+        results[cell]["tps"].append(summary["tps"])
+        results[cell]["p95_ms"].append(summary["p95_ms"])
+
+    for _ in range(min_trials):
+        for c in cells:
+            trial(c)
+
+    while True:
+        cis = cell_cis(results)
+        open_cells = [c for c in cells
+                      if _width(cis[c]) > target and len(results[c]["tps"]) < max_trials]
+        if not open_cells:
+            break
+        trial(max(open_cells, key=lambda c: _width(cis[c])))
+
+    log_adaptive(results, cis, target, max_trials)
+    return {c: {"trials": len(results[c]["tps"]), **cis[c]} for c in cells}
+
+def log_adaptive(results: dict, cis: dict, target: float, max_trials: int):
+    path = Path("adaptive_trials.csv")
+    need_header = not path.exists()
+    with path.open("a", encoding="utf-8") as f:
+        if need_header:
+            f.write("timestamp,alg,payload_bytes,trials,converged,target_rel_width,max_trials,"
+                    "median_tps,median_tps_ci_lo,median_tps_ci_hi,tps_rel_width,"
+                    "p95_ms,p95_ms_ci_lo,p95_ms_ci_hi,p95_rel_width\n")
+        ts = f"{time.time():.3f}"
+        for (alg, payload_bytes), ci in cis.items():
+            t, p = ci["tps"], ci["p95_ms"]
+            f.write(",".join([
+                ts, alg, str(payload_bytes), str(len(results[(alg, payload_bytes)]["tps"])),
+                "True" if _width(ci) <= target else "False", f"{target:.4f}", str(max_trials),
+                f"{t[0]:.6f}", f"{t[1]:.6f}", f"{t[2]:.6f}", f"{t[3]:.6f}",
+                f"{p[0]:.6f}", f"{p[1]:.6f}", f"{p[2]:.6f}", f"{p[3]:.6f}",
+            ]) + "\n")
+
+def main():
+    live_metrics.start_from_env()
+    out = run_adaptive()
+    print("\nAdaptive schedule:")
+    for (alg, payload_bytes), r in out.items():
+        print(f" - {alg} {payload_bytes}B: trials={r['trials']} "
+              f"tps_rel_width={r['tps'][3]:.3f} p95_rel_width={r['p95_ms'][3]:.3f}")
+    print("Results appended to 'adaptive_trials.csv' (per-trial rows in blockchain_metrics.csv / verification_log.csv).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+sharding.py — S independent chains, one worker process per shard.
+Each shard has its own Consensus, validator set and signers. After producing a block the
+producer may emit a signed cross-shard receipt; receipts travel through multiprocessing
+queues and are verified (signature + stateful anti-replay) on the destination shard.
+Reports aggregate TPS, cross-shard latency and per-shard CPU / peak RSS as S grows.
+Workers start producing together on a barrier, and aggregate TPS is taken over the slowest shard's
+production time, so process launch and the shutdown handshake are not counted.
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import statistics as stats
+import multiprocessing as mp
+from queue import Empty
+from pathlib import Path
+
+from consensus import Consensus
+from node import Node, ReplayGuard
+
+DEFAULT_ROUNDS = 200
+DEFAULT_VALIDATORS = 8
+DEFAULT_PAYLOAD = 512
+DEFAULT_CROSS_RATIO = 0.2   # fraction of blocks that emit a cross-shard receipt
+_DONE = "DONE"
+
+def receipt_msg(src: int, dst: int, height: int, block_hash: str) -> bytes:
+    return f"receipt|{src}|{dst}|{height}|{block_hash}".encode("utf-8")
+
+def _peak_rss_kb():
+    # None where resource is unavailable (Windows); ru_maxrss is bytes on macOS, kB elsewhere
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+def _percentiles_ms(xs):
+    if not xs:
+        return 0.0, 0.0
+    p50 = stats.median(xs)
+    p95 = stats.quantiles(xs, n=100)[94] if len(xs) >= 100 else max(xs)
+    return p50 * 1000.0, p95 * 1000.0
+
+def _shard_worker(sid: int, shards: int, alg: str, validators: int, rounds: int, payload_bytes: int,
+                  cross_ratio: float, delay_range, inboxes, results, start, seed: int):
+    rng = random.Random(seed)
+    nodes = [Node(alg=alg, node_id=f"S{sid}-N{i}") for i in range(validators)]
+    cons = Consensus(nodes)
+    verifier = ReplayGuard()
+    inbox = inboxes[sid]
+    out = {"shard": sid, "blocks": 0, "valid_blocks": 0, "receipts_sent": 0,
+           "receipts_received": 0, "receipts_valid": 0, "latencies": []}
+
+    def handle(item):
+        if item == _DONE:
+            return True
+        now = time.time()
+        out["receipts_received"] += 1
+        msg = receipt_msg(item["src"], item["dst"], item["height"], item["block_hash"])
+        if item["dst"] == sid and verifier.accept(msg, item["signature"], item["public_key"], item["alg"]):
+            out["receipts_valid"] += 1
+        out["latencies"].append(now - item["sent_at"])
+        return False
+
+    done = 0   # peers that have finished producing
+    start.wait()   # every shard (and the parent) is up; start producing together
+    t0 = time.perf_counter()
+    last_hash = "0" * 64
+    for i in range(rounds):
+        if delay_range[1] > 0:
+            time.sleep(rng.uniform(*delay_range))
+        block, b = cons.produce(i, last_hash, payload_bytes)
+        last_hash = cons.hash_block(block)
+        out["blocks"] += 1
+        msg = f"{b['index']}|{b['previous_hash']}|{b['data']}".encode("utf-8")
+        if verifier.accept(msg, b["signature"], b["public_key"], b["alg"]):
+            out["valid_blocks"] += 1
+
+        if shards > 1 and rng.random() < cross_ratio:
+            dst = rng.choice([s for s in range(shards) if s != sid])
+            producer = nodes[i % len(nodes)]
+            sig = producer.signer.sign(receipt_msg(sid, dst, i, b["block_hash"]))
+            inboxes[dst].put({"src": sid, "dst": dst, "height": i, "block_hash": b["block_hash"],
+                              "signature": sig, "public_key": producer.signer.pk,
+                              "alg": producer.signer.name, "sent_at": time.time()})
+            out["receipts_sent"] += 1
+
+        # drain whatever has arrived without blocking block production
+        while True:
+            try:
+                done += handle(inbox.get_nowait())
+            except Empty:
+                break
+    produce_sec = time.perf_counter() - t0
+
+    # tell peers we are done, then wait for every peer's DONE so no receipt is lost
+    for s in range(shards):
+        if s != sid:
+            inboxes[s].put(_DONE)
+    while done < shards - 1:
+        done += handle(inbox.get())
+
+    out.update({"produce_sec": produce_sec, "cpu_sec": time.process_time(), "maxrss_kb": _peak_rss_kb()})
+    results.put(out)
+
+def run_sharded(shards: int, alg: str, validators: int = DEFAULT_VALIDATORS, rounds: int = DEFAULT_ROUNDS,
+                payload_bytes: int = DEFAULT_PAYLOAD, cross_ratio: float = DEFAULT_CROSS_RATIO,
+                delay_range=(0.0, 0.0), seed: int = 0):
+    inboxes = [mp.Queue() for _ in range(shards)]
+    results = mp.Queue()
+    start = mp.Barrier(shards + 1)
+    procs = [mp.Process(target=_shard_worker,
+                        args=(s, shards, alg, validators, rounds, payload_bytes, cross_ratio,
+                              delay_range, inboxes, results, start, seed * 1000 + s))
+             for s in range(shards)]
+    for p in procs:
+        p.start()
+    start.wait()   # released once every worker has finished its setup
+    t0 = time.perf_counter()
+    per_shard = [results.get() for _ in procs]   # drain before join so workers can exit
+    wall = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+    per_shard.sort(key=lambda r: r["shard"])
+
+    lat = [x for r in per_shard for x in r["latencies"]]
+    p50, p95 = _percentiles_ms(lat)
+    total_blocks = sum(r["blocks"] for r in per_shard)
+    produce = max(r["produce_sec"] for r in per_shard)
+    summary = {
+        "shards": shards,
+        "tps": total_blocks / max(produce, 1e-9),
+        "blocks": total_blocks,
+        "receipts_sent": sum(r["receipts_sent"] for r in per_shard),
+        "receipts_valid": sum(r["receipts_valid"] for r in per_shard),
+        "xshard_p50_ms": p50,
+        "xshard_p95_ms": p95,
+        "produce_sec": produce,
+        "wall_sec": wall,   # from the start barrier to the last result, incl. the DONE handshake
+    }
+    return summary, per_shard
+
+def _kb(v) -> str:
+    return "" if v is None else str(v)
+
+def log_sharded(summary, per_shard, alg: str, validators: int, rounds: int, payload_bytes: int, run_id: str):
+    path = Path("shard_log.csv")
+    need_header = not path.exists()
+    with path.open("a", encoding="utf-8") as f:
+        if need_header:
+            f.write("timestamp,run_id,alg,shards,validators,rounds,payload_bytes,kind,shard,tps,blocks,"
+                    "receipts_sent,receipts_received,receipts_valid,xshard_p50_ms,xshard_p95_ms,cpu_sec,maxrss_kb\n")
+        ts = f"{time.time():.3f}"
+        common = [ts, run_id, alg, str(summary["shards"]), str(validators), str(rounds), str(payload_bytes)]
+        for r in per_shard:
+            p50, p95 = _percentiles_ms(r["latencies"])
+            f.write(",".join(common + [
+                "shard", str(r["shard"]),
+                f"{r['blocks'] / max(r['produce_sec'], 1e-9):.6f}",
+                str(r["blocks"]), str(r["receipts_sent"]), str(r["receipts_received"]), str(r["receipts_valid"]),
+                f"{p50:.6f}", f"{p95:.6f}", f"{r['cpu_sec']:.6f}", _kb(r["maxrss_kb"]),
+            ]) + "\n")
+        f.write(",".join(common + [
+            "summary", "",
+            f"{summary['tps']:.6f}",
+            str(summary["blocks"]), str(summary["receipts_sent"]),
+            str(sum(r["receipts_received"] for r in per_shard)), str(summary["receipts_valid"]),
+            f"{summary['xshard_p50_ms']:.6f}", f"{summary['xshard_p95_ms']:.6f}",
+            f"{sum(r['cpu_sec'] for r in per_shard):.6f}",
+            _kb(max((r["maxrss_kb"] for r in per_shard if r["maxrss_kb"] is not None), default=None)),
+        ]) + "\n")
+
+def run_shard_experiment(rounds=DEFAULT_ROUNDS, validators=DEFAULT_VALIDATORS, payload_bytes=DEFAULT_PAYLOAD,
+                         shard_counts=None):
+    if shard_counts is None:
+        cores = os.cpu_count() or 1
+        shard_counts = [s for s in (1, 2, 4, 8, 16, 32) if s <= cores] or [1]
+    algorithms = ["sphincs-sim", "xmss-sim", "lms-sim"]
+    for shards in shard_counts:
+        for alg in algorithms:
+            run_id = str(uuid.uuid4())[:8]
+            summary, per_shard = run_sharded(shards, alg, validators, rounds, payload_bytes)
+            log_sharded(summary, per_shard, alg, validators, rounds, payload_bytes, run_id)
+            print(f"[S={shards} {alg}] {summary}")
+
+def main():
+    run_shard_experiment()
+    print("Results appended to 'shard_log.csv'.")
+
+if __name__ == "__main__":
+    main()
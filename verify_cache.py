@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+verify_cache.py — bounded LRU cache of stateless signature-verification results.
+Stateless verification is a pure function of (pk, msg, sig), so validators in one
+process can share a single cache and skip re-checking blocks they have already seen.
+Stateful XMSS/LMS blocks never go through the cache (see Node.verify_block).
+The key digest goes through hashops, so its cost shows up in the compression counts.
+"""
+import time
+import struct
+from pathlib import Path
+from collections import OrderedDict
+
+import hashops
+
+def cache_key(pk: bytes, msg: bytes, sig: bytes) -> bytes:
+    # length-prefix each field so (pk, msg, sig) boundaries cannot be shifted
+    return hashops.digest(b"".join(struct.pack(">I", len(part)) + part for part in (pk, msg, sig)))
+
+class VerifyCache:
+    def __init__(self, capacity: int = 4096):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: bytes):
+        # returns the cached bool, or None on a miss
+        ok = self._entries.get(key)
+        if ok is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return ok
+
+    def put(self, key: bytes, ok: bool):
+        self._entries[key] = bool(ok)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cache_size": len(self._entries),
+            "cache_capacity": self.capacity,
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_evictions": self.evictions,
+            "cache_hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+def gossip_sweep(blocks, validators) -> dict:
+    """
+    Every validator verifies every block, as in a full-mesh gossip round.
+    Returns how many checks were requested vs. actually computed, and the total
+    hash compressions spent (signature checks plus cache-key digests), so the net
+    saving is read off by comparing a cached sweep against an uncached one.
+    """
+    requested = 0
+    valid = 0
+    before = sum(v.sig_checks for v in validators)
+    snap = hashops.counter.snapshot()
+    for b in blocks:
+        for v in validators:
+            requested += 1
+            if v.verify_block(b):
+                valid += 1
+    computed = sum(v.sig_checks for v in validators) - before
+    ops = hashops.counter.since(snap)
+    return {
+        "validators": len(validators),
+        "blocks": len(blocks),
+        "verifications_requested": requested,
+        "verifications_computed": computed,
+        "verifications_saved": requested - computed,
+        "valid": valid,
+        "compressions": ops["compressions"],
+        "bytes_hashed": ops["bytes_hashed"],
+    }
+
+def log_sweep(sweep: dict, alg: str, cached: bool, payload_bytes: int, baseline_compressions: int):
+    path = Path("verify_cache_log.csv")
+    need_header = not path.exists()
+    with path.open("a", encoding="utf-8") as f:
+        if need_header:
+            f.write("timestamp,alg,cached,validators,blocks,payload_bytes,hash_backend,verifications_requested,"
+                    "verifications_computed,verifications_saved,compressions,bytes_hashed,net_compressions_saved,"
+                    "cache_hits,cache_misses,cache_evictions\n")
+        f.write(",".join([
+            f"{time.time():.3f}", alg, str(cached), str(sweep["validators"]), str(sweep["blocks"]),
+            str(payload_bytes), hashops.backend_name(),
+            str(sweep["verifications_requested"]), str(sweep["verifications_computed"]),
+            str(sweep["verifications_saved"]), str(sweep["compressions"]), str(sweep["bytes_hashed"]),
+            str(baseline_compressions - sweep["compressions"]),
+            str(sweep.get("cache_hits", "")), str(sweep.get("cache_misses", "")),
+            str(sweep.get("cache_evictions", "")),
+        ]) + "\n")
+
+def main(validators_n: int = 8, rounds: int = 200, payload_bytes: int = 512):
+    from node import Node
+    for alg in ["sphincs-sim", "xmss-sim", "lms-sim"]:
+        producer = Node(alg=alg, node_id="P0")
+        blocks = []
+        prev_hash = "GENESIS"
+        for i in range(rounds):
+            blk = producer.create_block(index=i, previous_hash=prev_hash, data="X" * payload_bytes)
+            blocks.append(blk)
+            prev_hash = blk["block_hash"]
+
+        # same blocks, same validator count: once without a cache, once with a shared one
+        plain = gossip_sweep(blocks, [Node(alg=alg, node_id=f"V{i}") for i in range(validators_n)])
+        log_sweep(plain, alg, False, payload_bytes, plain["compressions"])
+
+        shared = VerifyCache(capacity=max(1, rounds))
+        validators = [Node(alg=alg, node_id=f"V{i}", cache=shared) for i in range(validators_n)]
+        sweep = gossip_sweep(blocks, validators)
+        sweep.update(shared.stats())
+        log_sweep(sweep, alg, True, payload_bytes, plain["compressions"])
+        print(f"{alg}: {sweep} net_compressions_saved={plain['compressions'] - sweep['compressions']}")
+    print("Results appended to 'verify_cache_log.csv'.")
+
+if __name__ == "__main__":
+    main()